@@ -2,18 +2,19 @@ import os
 import re
 import io
 import json
+import hashlib
 import logging
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 
 import fitz  # PyMuPDF
-import psycopg2
 import requests
-from flask import Flask, request, jsonify, send_file, render_template_string
+from requests.adapters import HTTPAdapter
+from flask import Flask, request, jsonify, send_file, render_template
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from fpdf import FPDF
 from datetime import timezone, datetime
-from collections import Counter
 from zoneinfo import ZoneInfo
 
 # ==== ReportLab for PDF Generation ====
@@ -32,7 +33,11 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
 # ==== Local Module ====
-from insight_db import init_db, log_upload, get_insight, get_submission_detail
+from cache import LRUCache
+from insight_db import (
+    init_db, log_upload, get_insight, get_submission_detail, get_location_from_ip,
+    get_connection
+)
 
 
 pdfmetrics.registerFont(TTFont("ArialNova", "static/fonts/ArialNova.ttf"))
@@ -44,14 +49,6 @@ pdfmetrics.registerFontFamily(
     bold='ArialNova-Bold'
 )
 
-DB_CONFIG = {
-    "host": os.getenv("PGHOST"),
-    "port": os.getenv("PGPORT"),
-    "dbname": os.getenv("PGDATABASE"),
-    "user": os.getenv("PGUSER"),
-    "password": os.getenv("PGPASSWORD"),
-}
-
 # Konfigurasi logging
 logging.basicConfig(
     level=logging.DEBUG,
@@ -63,25 +60,114 @@ log.setLevel(logging.DEBUG)
 # Inisialisasi Flask
 app = Flask(__name__)
 CORS(app, expose_headers=["Content-Disposition"])
-UPLOAD_FOLDER = "uploads"
 init_db()
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+# upload_time disimpan sebagai TIMESTAMPTZ (UTC); ditampilkan dalam WIB
+JAKARTA_TZ = ZoneInfo("Asia/Jakarta")
 
 # ------------------ UTILITAS PDF ------------------
 
+# Tabel hapus karakter kontrol (selain \t, \n, \r) untuk str.translate
+_ILLEGAL_TBL = dict.fromkeys(
+    list(range(0x00, 0x09)) + [0x0B, 0x0C] + list(range(0x0E, 0x20)) + [0x7F],
+    None
+)
+
+# Pola regex dikompilasi sekali saat import
+_ABSTRACT_RE = re.compile(r"\bA\s*B\s*S\s*T\s*R\s*A\s*C\s*T\b", re.I)
+_STOP_RE = re.compile(
+    r"^("
+    r"(Keywords|Kata\s*Kunci)\s*[:\-]?\s*(.*)?$|"
+    r"(Introduction|Latar\s*Belakang|Chapter\s*1|Bab\s*1|"
+    r"(?:Chapter|Bab)?\s*(?:1|I)\.?\s+(?:Introduction|Latar\s*Belakang)|"
+    r"Notation|Background)"
+    r")\s*[:\-]?\s*$",
+    re.I | re.M
+)
+_PARA_RE = re.compile(r'\n\s*\n')
+
+# Abstrak hampir selalu ada di awal dokumen; batasi area pencarian pertama
+ABSTRACT_SCAN_LIMIT = 32768
+ABSTRACT_PAGE_OVERLAP = 64
+
 
 def remove_illegal_chars(text):
-    return re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', "", text)
+    return text.translate(_ILLEGAL_TBL)
 
 
-def extract_text_with_fitz(pdf_path):
-    with fitz.open(pdf_path) as doc:
-        return "\n".join(page.get_text("text") for page in doc)
+def iter_pdf_pages(pdf_bytes):
+    # PDF dibaca langsung dari memori; bersihkan per halaman agar teks
+    # gabungan tidak perlu dipindai ulang
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        for page in doc:
+            yield remove_illegal_chars(page.get_text("text"))
+
+
+# ------------------ LAPORAN PDF ------------------
+
+# Objek ReportLab yang sama untuk setiap laporan, dibuat sekali saat import
+_styles = getSampleStyleSheet()
+
+_normal_style = _styles["Normal"]
+_normal_style.fontName = "ArialNova"
+_normal_style.spaceAfter = 12
+
+JUSTIFIED_STYLE = ParagraphStyle(
+    name="Justified",
+    parent=_normal_style,
+    alignment=TA_JUSTIFY,
+    fontSize=11,
+    fontName="ArialNova"
+)
+
+HEADING_STYLE = ParagraphStyle(
+    name="Heading",
+    fontSize=14,
+    leading=16,
+    fontName="ArialNova-Bold",
+    textColor=HexColor("#31572C"),
+    alignment=TA_LEFT,
+    spaceBefore=12,
+    spaceAfter=6
+)
 
+RESULT_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), HexColor("#31572C")),
+    ("TEXTCOLOR", (0, 0), (-1, 0), HexColor("#FFFFFF")),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("ALIGN", (1, 1), (-1, -1), "RIGHT"),
+    ("FONTSIZE", (0, 0), (-1, -1), 10),
+    ("BOTTOMPADDING", (0, 0), (-1, 0), 6),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1),
+     [HexColor("#F5F5F5"), HexColor("#FFFFFF")]),
+    ("GRID", (0, 0), (-1, -1), 0.5, HexColor("#CCCCCC"))
+])
+
+SDG_NAMES = {
+    1: "No Poverty",
+    2: "Zero Hunger",
+    3: "Good Health and Well-being",
+    4: "Quality Education",
+    5: "Gender Equality",
+    6: "Clean Water and Sanitation",
+    7: "Affordable and Clean Energy",
+    8: "Decent Work and Economic Growth",
+    9: "Industry, Innovation and Infrastructure",
+    10: "Reduced Inequalities",
+    11: "Sustainable Cities and Communities",
+    12: "Responsible Consumption and Production",
+    13: "Climate Action",
+    14: "Life Below Water",
+    15: "Life on Land",
+    16: "Peace, Justice and Strong Institutions",
+    17: "Partnerships for the Goals"
+}
 
-def extract_text_from_pdf(pdf_path):
-    text = extract_text_with_fitz(pdf_path)
-    return remove_illegal_chars(text)
+# Divider selebar halaman A4 dikurangi margin, rasio gambar dipertahankan
+DIVIDER_PATH = "uploads/divider.png"
+_divider_orig_width, _divider_orig_height = ImageReader(DIVIDER_PATH).getSize()
+DIVIDER_WIDTH = A4[0] - 1 * inch
+DIVIDER_HEIGHT = _divider_orig_height * (DIVIDER_WIDTH / _divider_orig_width)
 
 
 def draw_header(canvas, doc):
@@ -129,31 +215,40 @@ def draw_first_page(canvas, doc):
     draw_footer(canvas, doc)
 
 
+def _text_head(text):
+    """Potongan awal teks (dipotong di batas baris) tempat abstrak biasanya berada."""
+    if len(text) <= ABSTRACT_SCAN_LIMIT:
+        return text
+    cut = text.rfind("\n", 0, ABSTRACT_SCAN_LIMIT)
+    return text[:cut + 1] if cut > 0 else text
+
+
+def _search_head_first(pattern, text, head, start=0):
+    """Cari di potongan awal dulu; pindai seluruh teks hanya jika tidak ketemu."""
+    match = pattern.search(head[start:])
+    if match is None and len(head) < len(text):
+        match = pattern.search(text[start:])
+    return match
+
+
 def extract_abstract(text):
-    abstract_match = re.search(r"(?i)\bA\s*B\s*S\s*T\s*R\s*A\s*C\s*T\b", text)
-    stop_heading_pattern = (
-        r"(?im)^("
-        r"(Keywords|Kata\s*Kunci)\s*[:\-]?\s*(.*)?$|"
-        r"(Introduction|Latar\s*Belakang|Chapter\s*1|Bab\s*1|"
-        r"(?:Chapter|Bab)?\s*(?:1|I)\.?\s+(?:Introduction|Latar\s*Belakang)|"
-        r"Notation|Background)"
-        r")\s*[:\-]?\s*$"
-    )
+    head = _text_head(text)
+    abstract_match = _search_head_first(_ABSTRACT_RE, text, head)
 
     if abstract_match:
         abstract_start = abstract_match.end()
-        stop_after_abstract = re.search(
-            stop_heading_pattern, text[abstract_start:])
+        stop_after_abstract = _search_head_first(
+            _STOP_RE, text, head, abstract_start)
         if stop_after_abstract:
             abstract_end = abstract_start + stop_after_abstract.start()
             return text[abstract_start:abstract_end].strip()
         else:
             return " ".join(text[abstract_start:].split()[:300])
     else:
-        stop_match = re.search(stop_heading_pattern, text)
+        stop_match = _search_head_first(_STOP_RE, text, head)
         if stop_match:
             pre = text[:stop_match.start()].rstrip()
-            paras = list(re.finditer(r'\n\s*\n', pre))
+            paras = list(_PARA_RE.finditer(pre))
             if paras:
                 return pre[paras[-1].end():].strip()
             else:
@@ -162,27 +257,106 @@ def extract_abstract(text):
             return " ".join(text.split()[:300])
 
 
+def extract_abstract_from_pdf(pdf_bytes):
+    """
+    Sama dengan extract_abstract() atas seluruh teks PDF, tetapi halaman
+    dibaca satu per satu dan berhenti begitu judul abstrak dan heading
+    penutupnya sudah ditemukan, sehingga sisa dokumen tidak perlu diekstrak.
+    """
+    text = ""
+    abstract_start = None
+    stop_scan_from = None
+
+    for i, page_text in enumerate(iter_pdf_pages(pdf_bytes)):
+        if i:
+            text += "\n"
+        page_offset = len(text)
+        text += page_text
+
+        if abstract_start is None:
+            # Sedikit overlap untuk judul yang terpotong di batas halaman
+            abstract_match = _ABSTRACT_RE.search(
+                text, max(0, page_offset - ABSTRACT_PAGE_OVERLAP))
+            if not abstract_match:
+                continue
+            abstract_start = abstract_match.end()
+            stop_scan_from = abstract_start
+
+        if stop_scan_from == abstract_start:
+            # ^ harus cocok di awal abstrak, sama seperti extract_abstract()
+            stop_match = _STOP_RE.search(text[abstract_start:])
+            stop_start = abstract_start + stop_match.start() if stop_match else None
+        else:
+            stop_match = _STOP_RE.search(text, stop_scan_from)
+            stop_start = stop_match.start() if stop_match else None
+        if stop_start is not None:
+            return text[abstract_start:stop_start].strip()
+
+        # Heading penutup bisa terpotong di batas halaman (pola memakai \s*),
+        # jadi pencarian berikutnya dimulai lagi dari awal halaman ini saja.
+        # Halaman kosong tidak menggeser posisi agar heading tetap tersambung.
+        if page_text.strip() and page_offset > abstract_start:
+            stop_scan_from = page_offset
+
+    # Abstrak tidak lengkap/tidak ada: pakai logika fallback atas seluruh teks
+    return extract_abstract(text)
+
+
 # ------------------ KLASIFIKASI MODEL ------------------
 
+# Session bersama agar koneksi TLS ke API SDG dipakai ulang antar request
+HTTP_POOL_SIZE = 10
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE,
+    # Tunggu koneksi bebas daripada membuka koneksi ekstra yang lalu dibuang
+    pool_block=True))
+
+# Executor bersama untuk klasifikasi batch, seukuran pool koneksi di atas
+_CLASSIFY_EXECUTOR = ThreadPoolExecutor(max_workers=HTTP_POOL_SIZE)
+
+# Cache LRU hasil klasifikasi, key: (model, sha256 abstrak)
+CLASSIFY_CACHE_SIZE = 1024
+_classify_cache = LRUCache(CLASSIFY_CACHE_SIZE)
+
 
 def classify_with_model(abstract, model="elsevier"):
     """
     Memanggil model SDG berdasarkan pilihan:
       - "elsevier" → elsevier-sdg-multi (16 goals, THE)
       - "aurora"   → aurora-sdg-multi (17 goals)
+    Abstrak yang sama tidak dikirim ulang ke API selama masih ada di cache.
     """
+    if model != "aurora":
+        # default ke Elsevier
+        model = "elsevier"
+
+    key = (model, hashlib.sha256(
+        abstract.encode("utf-8", "surrogatepass")).hexdigest())
+    cached = _classify_cache.get(key)
+    if cached is not None:
+        logging.info(f"✅ SDG Classification ({model}): dari cache")
+        return cached
+
+    all_sdg_scores = _request_classification(abstract, model)
+    # Hasil kosong (API gagal) tidak di-cache
+    if all_sdg_scores:
+        _classify_cache.set(key, all_sdg_scores)
+    return all_sdg_scores
+
+
+def _request_classification(abstract, model):
     if model == "aurora":
         url = "https://aurora-sdg.labs.vu.nl/classifier/classify/aurora-sdg-multi"
     else:
-        # default ke Elsevier
-        model = "elsevier"
         url = "https://aurora-sdg.labs.vu.nl/classifier/classify/elsevier-sdg-multi"
 
     headers = {"Content-Type": "application/json"}
     payload = json.dumps({"text": abstract})
 
     try:
-        response = requests.post(url, headers=headers, data=payload)
+        response = _SESSION.post(
+            url, headers=headers, data=payload, timeout=(3, 30))
         if response.status_code == 200:
             predictions = response.json().get("predictions", [])
 
@@ -206,10 +380,26 @@ def classify_with_model(abstract, model="elsevier"):
         return {}
 
 
-def process_single_pdf(pdf_path, model="elsevier"):
+def classify_many_with_model(abstracts, model="elsevier"):
+    """
+    Klasifikasi beberapa abstrak sekaligus.
+    API SDG hanya menerima satu teks per panggilan, jadi panggilan dikirim
+    paralel lewat session bersama. Urutan hasil sama dengan urutan input.
+    """
+    if not abstracts:
+        return []
+    if len(abstracts) == 1:
+        return [classify_with_model(abstracts[0], model=model)]
+
+    return list(_CLASSIFY_EXECUTOR.map(
+        lambda abstract: classify_with_model(abstract, model=model),
+        abstracts
+    ))
+
+
+def process_single_pdf(pdf_bytes, model="elsevier"):
     try:
-        full_text = extract_text_from_pdf(pdf_path)
-        abstract = extract_abstract(full_text)
+        abstract = extract_abstract_from_pdf(pdf_bytes)
         sdg_result = classify_with_model(abstract, model=model)
         return {
             "status": "success",
@@ -220,8 +410,35 @@ def process_single_pdf(pdf_path, model="elsevier"):
         logging.error(f"❌ Error di process_single_pdf: {str(e)}")
         return {"status": "error", "message": str(e)}
 
+
+def process_multiple_pdfs(pdf_files, model="elsevier"):
+    """Ekstrak abstrak dari beberapa PDF, lalu klasifikasikan dalam satu batch."""
+    results = []
+    abstracts = []
+    for pdf_bytes in pdf_files:
+        try:
+            abstract = extract_abstract_from_pdf(pdf_bytes)
+            results.append({"status": "success", "abstract": abstract})
+            abstracts.append(abstract)
+        except Exception as e:
+            logging.error(f"❌ Error di process_multiple_pdfs: {str(e)}")
+            results.append({"status": "error", "message": str(e)})
+
+    sdg_results = iter(classify_many_with_model(abstracts, model=model))
+    for result in results:
+        if result["status"] == "success":
+            result["sdg"] = next(sdg_results)
+    return results
+
 # ------------------ ROUTES ------------------
 
+# Executor untuk lookup lokasi IP agar berjalan bersamaan dengan klasifikasi
+_LOOKUP_EXECUTOR = ThreadPoolExecutor(max_workers=HTTP_POOL_SIZE)
+
+
+def start_location_lookup(ip_address):
+    return _LOOKUP_EXECUTOR.submit(get_location_from_ip, ip_address)
+
 
 @app.route("/", methods=["GET"])
 def index():
@@ -244,6 +461,7 @@ def classify_text_api():
         return jsonify({"status": "error", "message": "Text is empty."}), 400
 
     model = data.get("model", "elsevier")
+    location_future = start_location_lookup(request.remote_addr)
 
     abstract = text
     sdg_result = classify_with_model(abstract, model=model)
@@ -255,7 +473,8 @@ def classify_text_api():
     ]
 
     filename_label = f"TEXT_INPUT_{model.upper()}"
-    submission_id = log_upload(filename_label, request.remote_addr, sdg_list)
+    submission_id = log_upload(filename_label, request.remote_addr, sdg_list,
+                               location_data=location_future.result())
 
     return jsonify({
         "status": "success",
@@ -270,18 +489,21 @@ def extract_abstract_api():
     if "file" not in request.files:
         return jsonify({"status": "error", "message": "No file uploaded."}), 400
 
-    file = request.files["file"]
-    if file.filename == "":
+    files = request.files.getlist("file")
+    if any(f.filename == "" for f in files):
         return jsonify({"status": "error", "message": "Filename is empty."}), 400
 
     # model dipilih dari form (Elsevier / Aurora)
     model = request.form.get("model", "elsevier")
+    location_future = start_location_lookup(request.remote_addr)
 
+    if len(files) > 1:
+        return extract_abstract_batch(files, model, location_future)
+
+    file = files[0]
     filename = secure_filename(file.filename)
-    file_path = os.path.join(UPLOAD_FOLDER, filename)
-    file.save(file_path)
 
-    result = process_single_pdf(file_path, model=model)
+    result = process_single_pdf(file.read(), model=model)
 
     sdg_list = []
     if result.get("status") == "success":
@@ -290,41 +512,63 @@ def extract_abstract_api():
             int(sdg.replace("Goal ", "")) for sdg, score in sdg_scores.items() if score > 30
         ]
 
-    submission_id = log_upload(filename, request.remote_addr, sdg_list)
+    submission_id = log_upload(filename, request.remote_addr, sdg_list,
+                               location_data=location_future.result())
 
-    os.remove(file_path)
     result["submission_id"] = submission_id
     return jsonify(result)
 
 
-@app.route("/admin", methods=["GET"])
-def admin_dashboard():
-    conn = psycopg2.connect(**DB_CONFIG)
-    cur = conn.cursor()
+def extract_abstract_batch(files, model, location_future):
+    """Beberapa file dalam satu upload: abstrak diklasifikasikan sekaligus."""
+    filenames = [secure_filename(f.filename) for f in files]
+    results = process_multiple_pdfs([f.read() for f in files], model=model)
+    location_data = location_future.result()
 
-    cur.execute("SELECT upload_time FROM uploads_new")
-    all_times = [row[0] for row in cur.fetchall() if row[0]]
+    for filename, result in zip(filenames, results):
+        sdg_list = []
+        if result.get("status") == "success":
+            sdg_scores = result.get("sdg", {})
+            sdg_list = [
+                int(sdg.replace("Goal ", "")) for sdg, score in sdg_scores.items() if score > 30
+            ]
 
-    cur.execute("""
-        SELECT filename, upload_time, ip, location, sdg
-        FROM uploads_new
-        ORDER BY upload_time DESC
-        LIMIT 10
-    """)
-    recent = cur.fetchall()
+        result["filename"] = filename
+        result["submission_id"] = log_upload(
+            filename, request.remote_addr, sdg_list, location_data=location_data)
 
-    total = len(all_times)
-    last_upload = max(all_times) if all_times else None
+    return jsonify({"status": "success", "results": results})
 
-    from collections import Counter
-    from datetime import datetime
-    from zoneinfo import ZoneInfo
 
-    month_counts = Counter(dt.strftime("%Y-%m") for dt in all_times)
-    sorted_months = sorted(month_counts.keys(),
-                           key=lambda x: datetime.strptime(x, "%Y-%m"))
-    month_labels = [m for m in sorted_months]
-    month_values = [month_counts[m] for m in sorted_months]
+@app.route("/admin", methods=["GET"])
+def admin_dashboard():
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            # Agregasi per bulan dilakukan di Postgres, bukan di Python
+            cur.execute("""
+                SELECT to_char(upload_time AT TIME ZONE 'Asia/Jakarta', 'YYYY-MM') AS month,
+                       COUNT(*)
+                FROM uploads_new
+                WHERE upload_time IS NOT NULL
+                GROUP BY month
+                ORDER BY month
+            """)
+            month_rows = cur.fetchall()
+
+            cur.execute("SELECT MAX(upload_time) FROM uploads_new")
+            last_upload = cur.fetchone()[0]
+
+            cur.execute("""
+                SELECT filename, upload_time, ip, location, sdg
+                FROM uploads_new
+                ORDER BY upload_time DESC
+                LIMIT 10
+            """)
+            recent = cur.fetchall()
+
+    month_labels = [month for month, _ in month_rows]
+    month_values = [count for _, count in month_rows]
+    total = sum(month_values)
 
     cumulative_values = []
     cumulative_sum = 0
@@ -332,186 +576,28 @@ def admin_dashboard():
         cumulative_sum += val
         cumulative_values.append(cumulative_sum)
 
-    conn.close()
-
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Platform Insight</title>
-        <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                margin: 40px;
-                background-color: #f9f9f9;
-                color: #333;
-            }}
-            h1 {{
-                color: #4A148C;
-            }}
-            .section {{
-                background-color: #fff;
-                padding: 20px;
-                margin-bottom: 30px;
-                border-radius: 8px;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.05);
-            }}
-            table {{
-                width: 100%;
-                border-collapse: collapse;
-                margin-top: 15px;
-            }}
-            th, td {{
-                border: 1px solid #ddd;
-                padding: 10px;
-                text-align: left;
-            }}
-            th {{
-                background-color: #f2f2f2;
-                color: #555;
-            }}
-            tr:nth-child(even) {{
-                background-color: #f8f8f8;
-            }}
-            canvas {{
-                width: 100%;
-                height: auto;
-                max-height: 350px;
-                display: block;
-                margin: 0 auto;
-            }}
-            .chart-container {{
-                width: 65%;
-                margin: 0 auto;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="section">
-            <h1>📊 Platform Insight</h1>
-            <p><strong>Total uploads:</strong> {total}</p>
-            <p><strong>Last upload:</strong> {last_upload.astimezone(ZoneInfo("Asia/Jakarta")).strftime('%Y-%m-%d %H:%M:%S') if last_upload else 'N/A'}</p>
-        </div>
-
-        <div class="section">
-            <h2>📈 Upload Trend per Month</h2>
-            <div class="chart-container">
-                <canvas id="uploadChart"></canvas>
-            </div>
-        </div>
-
-        <div class="section">
-            <h2>📈 Cumulative Upload Growth</h2>
-            <div class="chart-container">
-                <canvas id="cumulativeChart"></canvas>
-            </div>
-        </div>
-
-        <div class="section">
-            <h2>🕒 Last 10 uploads:</h2>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Filename</th>
-                        <th>Timestamp</th>
-                        <th>IP Address</th>
-                        <th>Location</th>
-                        <th>SDG</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    {''.join(
-                        f'<tr>'
-                        f'<td>{f}</td>'
-                        f'<td>{t.astimezone(ZoneInfo("Asia/Jakarta")).strftime("%Y-%m-%d %H:%M:%S")}</td>'
-                        f'<td>{ip}</td>'
-                        f'<td>{loc}</td>'
-                        f'<td>{sdg if sdg else "-"}</td>'
-                        f'</tr>'
-                        for f, t, ip, loc, sdg in recent
-                    )}
-                </tbody>
-            </table>
-        </div>
-
-        <script>
-            const ctx1 = document.getElementById('uploadChart').getContext('2d');
-            new Chart(ctx1, {{
-                type: 'line',
-                data: {{
-                    labels: {month_labels},
-                    datasets: [{{
-                        label: 'Uploads per Month',
-                        data: {month_values},
-                        borderColor: '#4A148C',
-                        backgroundColor: 'rgba(74, 20, 140, 0.1)',
-                        fill: true,
-                        tension: 0.3,
-                        pointRadius: 4,
-                        pointBackgroundColor: '#4A148C'
-                    }}]
-                }},
-                options: {{
-                    responsive: true,
-                    scales: {{
-                        y: {{
-                            beginAtZero: true,
-                            title: {{
-                                display: true,
-                                text: 'Number of Uploads'
-                            }}
-                        }},
-                        x: {{
-                            title: {{
-                                display: true,
-                                text: 'Month-Year'
-                            }}
-                        }}
-                    }}
-                }}
-            }});
-
-            const ctx2 = document.getElementById('cumulativeChart').getContext('2d');
-            new Chart(ctx2, {{
-                type: 'line',
-                data: {{
-                    labels: {month_labels},
-                    datasets: [{{
-                        label: 'Cumulative Uploads',
-                        data: {cumulative_values},
-                        borderColor: '#00695C',
-                        backgroundColor: 'rgba(0, 150, 136, 0.1)',
-                        fill: true,
-                        tension: 0.3,
-                        pointRadius: 4,
-                        pointBackgroundColor: '#00695C'
-                    }}]
-                }},
-                options: {{
-                    responsive: true,
-                    scales: {{
-                        y: {{
-                            beginAtZero: true,
-                            title: {{
-                                display: true,
-                                text: 'Total Uploads (Cumulative)'
-                            }}
-                        }},
-                        x: {{
-                            title: {{
-                                display: true,
-                                text: 'Month-Year'
-                            }}
-                        }}
-                    }}
-                }}
-            }});
-        </script>
-    </body>
-    </html>
-    """
-    return render_template_string(html)
+    time_format = "%Y-%m-%d %H:%M:%S"
+    recent_rows = [
+        {
+            "filename": f,
+            "upload_time": t.astimezone(JAKARTA_TZ).strftime(time_format) if t else "",
+            "ip": ip,
+            "location": loc,
+            "sdg": sdg,
+        }
+        for f, t, ip, loc, sdg in recent
+    ]
+
+    # Template di-cache Jinja dan auto-escape nilai dari database
+    return render_template(
+        "admin.html",
+        total=total,
+        last_upload=last_upload.astimezone(JAKARTA_TZ).strftime(time_format) if last_upload else None,
+        recent=recent_rows,
+        month_labels=month_labels,
+        month_values=month_values,
+        cumulative_values=cumulative_values,
+    )
 
 
 @app.route('/download_result', methods=['POST'])
@@ -534,7 +620,7 @@ def download_result():
 
     submission_id_str = f"{submission_id:05d}"
     submission_date_str = upload_time.astimezone(
-        ZoneInfo("Asia/Jakarta")).strftime("%Y-%m-%d %H:%M:%S")
+        JAKARTA_TZ).strftime("%Y-%m-%d %H:%M:%S")
 
     abstract = data.get("abstract", "")
     sdg_scores = data.get("sdg", {})
@@ -566,57 +652,14 @@ def download_result():
     )
     doc.title = "SMART SDG Classifier"
     doc.author = "https://super.universitaspertamina.ac.id/index.php/smart/"
-    styles = getSampleStyleSheet()
-
-    normal_style = styles["Normal"]
-    normal_style.fontName = "ArialNova"
-    normal_style.spaceAfter = 12
-
-    justified_style = ParagraphStyle(
-        name="Justified",
-        parent=normal_style,
-        alignment=TA_JUSTIFY,
-        fontSize=11,
-        fontName="ArialNova"
-    )
-
-    heading_style = ParagraphStyle(
-        name="Heading",
-        fontSize=14,
-        leading=16,
-        fontName="ArialNova-Bold",
-        textColor=HexColor("#31572C"),
-        alignment=TA_LEFT,
-        spaceBefore=12,
-        spaceAfter=6
-    )
 
     elements = []
-    SDG_NAMES = {
-        1: "No Poverty",
-        2: "Zero Hunger",
-        3: "Good Health and Well-being",
-        4: "Quality Education",
-        5: "Gender Equality",
-        6: "Clean Water and Sanitation",
-        7: "Affordable and Clean Energy",
-        8: "Decent Work and Economic Growth",
-        9: "Industry, Innovation and Infrastructure",
-        10: "Reduced Inequalities",
-        11: "Sustainable Cities and Communities",
-        12: "Responsible Consumption and Production",
-        13: "Climate Action",
-        14: "Life Below Water",
-        15: "Life on Land",
-        16: "Peace, Justice and Strong Institutions",
-        17: "Partnerships for the Goals"
-    }
 
     # Title space
     elements.append(Spacer(1, 42))
 
     # General Notes (now model-aware + jelaskan PDF vs text flow)
-    elements.append(Paragraph("General Notes", heading_style))
+    elements.append(Paragraph("General Notes", HEADING_STYLE))
     notes = f"""
     This application performs Sustainable Development Goal (SDG) classification based on either an abstract automatically extracted
     from a PDF document or text directly provided by the user.<br/><br/>
@@ -632,72 +675,51 @@ def download_result():
     This abstract/text-based analysis enables efficient and scalable SDG classification to support sustainability reporting,
     research mapping, and strategic decision-making.
     """
-    elements.append(Paragraph(notes, justified_style))
+    elements.append(Paragraph(notes, JUSTIFIED_STYLE))
     elements.append(Spacer(1, 18))
 
     # Divider image
-    divider_path = "uploads/divider.png"
-    img_reader = ImageReader(divider_path)
-    orig_width, orig_height = img_reader.getSize()
-
-    margin = 1 * inch
-    available_width = doc.pagesize[0] - margin
-
-    scale = available_width / orig_width
-    new_width = available_width
-    new_height = orig_height * scale
-
-    divider = Image(divider_path, width=new_width, height=new_height)
+    divider = Image(DIVIDER_PATH, width=DIVIDER_WIDTH, height=DIVIDER_HEIGHT)
 
     elements.append(divider)
     elements.append(Spacer(1, 16))
 
     # Meta info (tambahkan model di sini juga biar jelas)
     elements.append(Paragraph(
-        f"<b>Model Used:</b> <font color='#0000FF'>{model_full_name}</font>", justified_style))
+        f"<b>Model Used:</b> <font color='#0000FF'>{model_full_name}</font>", JUSTIFIED_STYLE))
     elements.append(Paragraph(
-        f"<b>Submission ID:</b> <font color='#0000FF'>{submission_id_str}</font>", justified_style))
+        f"<b>Submission ID:</b> <font color='#0000FF'>{submission_id_str}</font>", JUSTIFIED_STYLE))
     elements.append(Paragraph(
-        f"<b>Submission Date:</b> <font color='#0000FF'>{submission_date_str}</font>", justified_style))
+        f"<b>Submission Date:</b> <font color='#0000FF'>{submission_date_str}</font>", JUSTIFIED_STYLE))
     elements.append(Paragraph(
-        f"<b>File Name:</b> <font color='#0000FF'>{filename}</font>", justified_style))
+        f"<b>File Name:</b> <font color='#0000FF'>{filename}</font>", JUSTIFIED_STYLE))
 
     if not sdg_ids:
         elements.append(Paragraph(
-            "<b>SDG Detected (filter >30%):</b> <font color='#0000FF'>None</font>", justified_style))
+            "<b>SDG Detected (filter >30%):</b> <font color='#0000FF'>None</font>", JUSTIFIED_STYLE))
     else:
         sdg_texts = [f"Goal {sid} – {SDG_NAMES.get(sid, 'Unknown')}" for sid in sdg_ids]
         sdg_line = "; ".join(sdg_texts)
         elements.append(Paragraph(
-            f"<b>SDG Detected (filter >30%):</b> <font color='#0000FF'>{sdg_line}</font>", justified_style))
+            f"<b>SDG Detected (filter >30%):</b> <font color='#0000FF'>{sdg_line}</font>", JUSTIFIED_STYLE))
 
     elements.append(Spacer(1, 18))
 
     elements.append(PageBreak())
 
     # Abstract / Text section (judul diganti)
-    elements.append(Paragraph("Detected Abstract / Text", heading_style))
-    elements.append(Paragraph(abstract or "-", justified_style))
+    elements.append(Paragraph("Detected Abstract / Text", HEADING_STYLE))
+    elements.append(Paragraph(abstract or "-", JUSTIFIED_STYLE))
     elements.append(Spacer(1, 18))
 
     # SDG Classification Results
-    elements.append(Paragraph("SDG Classification Results", heading_style))
+    elements.append(Paragraph("SDG Classification Results", HEADING_STYLE))
 
     sorted_scores = sorted(sdg_scores.items(), key=lambda x: x[1], reverse=True)
     table_data = [["SDG", "Relevance (%)"]] + [[k, f"{v:.2f}%"] for k, v in sorted_scores]
 
     table = Table(table_data, colWidths=[3 * inch, 2 * inch])
-    table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), HexColor("#31572C")),
-        ("TEXTCOLOR", (0, 0), (-1, 0), HexColor("#FFFFFF")),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("ALIGN", (1, 1), (-1, -1), "RIGHT"),
-        ("FONTSIZE", (0, 0), (-1, -1), 10),
-        ("BOTTOMPADDING", (0, 0), (-1, 0), 6),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1),
-         [HexColor("#F5F5F5"), HexColor("#FFFFFF")]),
-        ("GRID", (0, 0), (-1, -1), 0.5, HexColor("#CCCCCC"))
-    ]))
+    table.setStyle(RESULT_TABLE_STYLE)
 
     elements.append(table)
 
@@ -1,7 +1,13 @@
 import psycopg2
-from datetime import datetime
+from psycopg2.pool import ThreadedConnectionPool
+from contextlib import contextmanager
+from datetime import datetime, timezone
 import os
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+
+from cache import LRUCache
 
 # Konfigurasi koneksi ke database PostgreSQL dari environment variables
 DB_CONFIG = {
@@ -12,29 +18,105 @@ DB_CONFIG = {
     "password": os.getenv("PGPASSWORD"),
 }
 
+# Session bersama untuk lookup lokasi IP (koneksi dipakai ulang)
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
+
+# Pool koneksi dibuat sekali per proses, dipakai ulang oleh semua query
+# psycopg2 menutup koneksi yang dikembalikan bila jumlah koneksi idle sudah
+# >= minconn, jadi minconn = jumlah thread Gunicorn (--threads 4) agar
+# koneksi tetap dipakai ulang saat request berjalan bersamaan
+DB_POOL_MIN = 4
+DB_POOL_MAX = 10
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(DB_POOL_MIN, DB_POOL_MAX, **DB_CONFIG)
+    return _pool
 
+
+@contextmanager
 def get_connection():
-    return psycopg2.connect(**DB_CONFIG)
+    pool = _get_pool()
+    conn = pool.getconn()
+    try:
+        # commit jika sukses, rollback jika error
+        with conn:
+            yield conn
+    finally:
+        pool.putconn(conn)
+
+
+# Kunci advisory agar init_db dari beberapa worker Gunicorn tidak balapan
+INIT_DB_LOCK_KEY = 727001
 
 
 def init_db():
     with get_connection() as conn:
         with conn.cursor() as cursor:
+            # Dilepas otomatis saat transaksi commit/rollback
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", (INIT_DB_LOCK_KEY,))
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS uploads_new (
                     id SERIAL PRIMARY KEY,
                     filename TEXT,
-                    upload_time TIMESTAMP,
+                    upload_time TIMESTAMPTZ,
                     ip TEXT,
                     location TEXT,
                     sdg INTEGER[]
                 )
             ''')
+            # Tabel lama menyimpan upload_time sebagai TIMESTAMP naif (waktu
+            # server, UTC); migrasikan sekali ke TIMESTAMPTZ
+            cursor.execute('''
+                SELECT data_type FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                  AND table_name = 'uploads_new'
+                  AND column_name = 'upload_time'
+            ''')
+            row = cursor.fetchone()
+            if row and row[0] == "timestamp without time zone":
+                cursor.execute('''
+                    ALTER TABLE uploads_new
+                    ALTER COLUMN upload_time TYPE TIMESTAMPTZ
+                    USING upload_time AT TIME ZONE 'UTC'
+                ''')
+            # Dashboard mengurutkan/mengambil MAX berdasarkan upload_time
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_uploads_upload_time
+                ON uploads_new (upload_time DESC)
+            ''')
         conn.commit()
 
+# Cache LRU + TTL untuk lokasi IP (IP dinamis bisa berpindah lokasi)
+LOCATION_CACHE_SIZE = 4096
+LOCATION_CACHE_TTL = 3600  # detik
+_location_cache = LRUCache(LOCATION_CACHE_SIZE, ttl=LOCATION_CACHE_TTL)
+
+
 def get_location_from_ip(ip_address):
+    cached = _location_cache.get(ip_address)
+    if cached is not None:
+        return cached
+
+    location = _lookup_location(ip_address)
+    # Lookup gagal tidak di-cache supaya dicoba lagi di upload berikutnya
+    if location:
+        _location_cache.set(ip_address, location)
+    return location
+
+
+def _lookup_location(ip_address):
     try:
-        response = requests.get(f"http://ip-api.com/json/{ip_address}")
+        response = _SESSION.get(
+            f"http://ip-api.com/json/{ip_address}", timeout=(3, 5))
         data = response.json()
         if data["status"] == "success":
             return {
@@ -48,8 +130,10 @@ def get_location_from_ip(ip_address):
     return {}
 
 
-def log_upload(filename, ip_address, sdg):
-    location_data = get_location_from_ip(ip_address)
+def log_upload(filename, ip_address, sdg, location_data=None):
+    # location_data bisa sudah di-lookup lebih dulu (paralel dengan klasifikasi)
+    if location_data is None:
+        location_data = get_location_from_ip(ip_address)
     location_str = ""
     if location_data:
         parts = [location_data.get("city"), location_data.get("region"), location_data.get("country")]
@@ -63,7 +147,7 @@ def log_upload(filename, ip_address, sdg):
                 VALUES (%s, %s, %s, %s, %s)
                 RETURNING id
                 """,
-                (filename, datetime.now(), ip_address, location_str, sdg)
+                (filename, datetime.now(timezone.utc), ip_address, location_str, sdg)
             )
             submission_id = cursor.fetchone()[0]
         conn.commit()